@@ -1,14 +1,22 @@
 """Audio processing: duration measurement and silence-based splitting."""
 
 import os
+import subprocess
+from functools import lru_cache
 from pathlib import Path
 
-from pydub import AudioSegment
-from pydub.silence import detect_silence
+import mutagen
+import mutagen.mp3
+import numpy as np
 
+import src.config as cfg
 from src.config import (
-    MAX_CHUNK_SECONDS,
+    AUDIO_CHANNELS,
+    AUDIO_QUALITY,
+    AUDIO_SAMPLE_RATE,
+    CHUNK_TAIL_TOLERANCE,
     MIN_SILENCE_MS,
+    SILENCE_SAMPLE_RATE,
     SILENCE_THRESH_DB,
     SPLIT_WINDOW_SECONDS,
     TEMP_DIR,
@@ -16,80 +24,212 @@ from src.config import (
 from src.utils import AudioProcessingError, logger
 
 
+@lru_cache(maxsize=4)
+def _probe_duration(path: str, mtime_ns: int) -> float:
+    """Read the duration from container headers (no PCM decode).
+
+    Uses mutagen, falling back to ffprobe for formats mutagen can't parse.
+    `mtime_ns` is only part of the cache key, so a rewritten file is
+    probed again.
+    """
+    try:
+        audio = mutagen.File(path)
+        length = getattr(audio.info, "length", 0) if audio is not None else 0
+        if length > 0:
+            return float(length)
+    except mutagen.MutagenError:
+        logger.debug("mutagen could not read %s, trying ffprobe", path)
+
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "csv=p=0",
+        path,
+    ]
+    out = subprocess.check_output(cmd, stderr=subprocess.PIPE, text=True)
+    return float(out.strip())
+
+
 def get_duration_seconds(path: str) -> float:
     """Get duration of an audio file in seconds."""
     try:
-        audio = AudioSegment.from_file(path)
-        return len(audio) / 1000.0
+        return _probe_duration(path, os.stat(path).st_mtime_ns)
     except Exception as e:
         raise AudioProcessingError(f"Failed to read audio file: {e}") from e
 
 
-def _find_silence_near(audio: AudioSegment, target_ms: int) -> int | None:
+def _ffmpeg_error(e: Exception) -> str:
+    """Describe a failed ffmpeg run, preferring the last lines of its stderr."""
+    stderr = getattr(e, "stderr", None)
+    lines = stderr.decode(errors="replace").strip().splitlines() if stderr else []
+    return " | ".join(lines[-3:]) if lines else str(e)
+
+
+def _decode_pcm(path: str) -> np.ndarray:
+    """Decode an audio file to mono 16-bit PCM samples at SILENCE_SAMPLE_RATE.
+
+    FFmpeg writes raw samples to a pipe, so nothing is materialized beyond
+    a single int16 array.
+    """
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-i", path,
+        "-f", "s16le", "-ac", "1", "-ar", str(SILENCE_SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        buf = subprocess.check_output(cmd, stderr=subprocess.PIPE)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise AudioProcessingError(
+            f"Failed to decode audio: {_ffmpeg_error(e)}"
+        ) from e
+    return np.frombuffer(buf, dtype=np.int16)
+
+
+def _silence_midpoints(segment: np.ndarray, keep_edge_runs: bool) -> np.ndarray:
+    """Return the midpoints (ms, relative to `segment`) of its silent runs.
+
+    A position is silent when the RMS of the following MIN_SILENCE_MS of
+    audio is below SILENCE_THRESH_DB (dBFS); window sums come from a single
+    cumulative sum of squared samples, so every window is O(1).  Runs touching
+    either end of the segment may continue past it, so they are dropped
+    unless `keep_edge_runs` is set.
+    """
+    per_ms = SILENCE_SAMPLE_RATE // 1000
+    win = MIN_SILENCE_MS * per_ms
+    if len(segment) < win:
+        return np.empty(0, dtype=np.int64)
+
+    # Window energy at every 1ms step.  RMS < thresh is the same test as
+    # sum(x^2) < thresh^2 * win, so no sqrt or division is needed, and the
+    # int64 prefix sum of squared int16 samples is exact.
+    squared = segment.astype(np.int64)
+    squared *= squared
+    cumsum = np.concatenate(([0], np.cumsum(squared)))
+    starts = np.arange(0, len(segment) - win + 1, per_ms)
+    energy = cumsum[starts + win] - cumsum[starts]
+    max_energy = (10 ** (SILENCE_THRESH_DB / 20) * 32768) ** 2 * win
+    silent = (energy < max_energy).astype(np.int8)
+
+    # Each run of silent window starts [a, b] covers audio [a, b + win).
+    edges = np.diff(np.concatenate(([0], silent, [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+    if not keep_edge_runs:
+        inner = (run_starts > 0) & (run_ends < len(silent) - 1)
+        run_starts, run_ends = run_starts[inner], run_ends[inner]
+
+    return (run_starts + run_ends + MIN_SILENCE_MS) // 2
+
+
+def _find_silence_near(samples: np.ndarray, target_ms: int) -> int | None:
     """Find the best silence point near `target_ms`.
 
-    Searches within a window of ±SPLIT_WINDOW_SECONDS around the target.
+    Searches outward from the target: first within a quarter of
+    ±SPLIT_WINDOW_SECONDS, doubling the radius until silence is found or
+    the full window has been scanned.  Silence usually sits close to the
+    target, so most searches only scan a fraction of the window.
     Returns the midpoint (in ms) of the silence segment closest to the target,
     or None if no silence is found in the window.
     """
+    per_ms = SILENCE_SAMPLE_RATE // 1000
+    total_ms = len(samples) // per_ms
     window_ms = SPLIT_WINDOW_SECONDS * 1000
-    search_start = max(0, target_ms - window_ms)
-    search_end = min(len(audio), target_ms + window_ms)
-    segment = audio[search_start:search_end]
-
-    silences = detect_silence(
-        segment,
-        min_silence_len=MIN_SILENCE_MS,
-        silence_thresh=SILENCE_THRESH_DB,
-    )
 
-    if not silences:
-        return None
+    radius_ms = window_ms // 4
+    while True:
+        radius_ms = min(radius_ms, window_ms)
+        search_start = max(0, target_ms - radius_ms)
+        search_end = min(total_ms, target_ms + radius_ms)
+        segment = samples[search_start * per_ms:search_end * per_ms]
+
+        full_window = radius_ms == window_ms
+        midpoints = _silence_midpoints(segment, keep_edge_runs=full_window)
+        if len(midpoints):
+            # Convert to absolute positions and pick the one closest to target.
+            midpoints = midpoints + search_start
+            return int(midpoints[np.argmin(np.abs(midpoints - target_ms))])
+
+        if full_window:
+            return None
+        radius_ms *= 2
+
+
+def _is_mp3(path: str) -> bool:
+    """Check the container is actually MP3, whatever the file extension."""
+    try:
+        return isinstance(mutagen.File(path), mutagen.mp3.MP3)
+    except mutagen.MutagenError:
+        return False
+
+
+def _export_chunks(path: str, split_points_ms: list[int], pattern: str) -> None:
+    """Cut `path` at `split_points_ms` into MP3 files named by `pattern`.
 
-    # Each silence is [start_ms, end_ms] relative to the segment.
-    # Convert to absolute positions and pick the one closest to target.
-    best = None
-    best_dist = float("inf")
-    for start, end in silences:
-        midpoint = search_start + (start + end) // 2
-        dist = abs(midpoint - target_ms)
-        if dist < best_dist:
-            best_dist = dist
-            best = midpoint
+    One ffmpeg process writes every chunk through the segment muxer;
+    `pattern` holds a printf-style index (e.g. "chunk_%03d.mp3").  MP3
+    sources are stream-copied (packets only, no re-encode); other formats
+    are encoded to MP3 at the upload settings in src.config.  The codec is
+    detected from the file contents, since downloads without an extension
+    are saved as .mp3 whatever they hold.
+    """
+    if _is_mp3(path):
+        codec = ["-c", "copy"]
+    else:
+        codec = [
+            "-c:a", "libmp3lame", "-b:a", f"{AUDIO_QUALITY}k",
+            "-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS),
+        ]
+
+    if split_points_ms:
+        output = [
+            "-f", "segment",
+            "-segment_times", ",".join(str(ms / 1000) for ms in split_points_ms),
+            "-reset_timestamps", "1",
+            pattern,
+        ]
+    else:
+        output = [pattern % 0]
 
-    return best
+    cmd = ["ffmpeg", "-v", "error", "-y", "-i", path, "-vn", *codec, *output]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise AudioProcessingError(
+            f"Failed to export chunks: {_ffmpeg_error(e)}"
+        ) from e
 
 
-def split_audio(path: str) -> list[str]:
+def split_audio(path: str, out_dir: Path = TEMP_DIR) -> list[tuple[str, float]]:
     """Split an audio file into chunks, cutting at silence points.
 
     Tries to split near every MAX_CHUNK_SECONDS boundary at a natural
     pause. Falls back to a hard cut if no silence is found nearby.
 
-    Returns a list of file paths for the chunk files (stored in TEMP_DIR).
+    Returns a list of (chunk_path, duration_s) tuples for the chunk files
+    (stored in `out_dir`).
     """
-    try:
-        audio = AudioSegment.from_file(path)
-    except Exception as e:
-        raise AudioProcessingError(f"Failed to load audio for splitting: {e}") from e
-
-    total_ms = len(audio)
-    chunk_target_ms = MAX_CHUNK_SECONDS * 1000
+    samples = _decode_pcm(path)
+    total_ms = len(samples) * 1000 // SILENCE_SAMPLE_RATE
+    # Read at call time so a --max-chunk override always applies.
+    chunk_seconds = cfg.MAX_CHUNK_SECONDS
+    chunk_target_ms = chunk_seconds * 1000
     base_name = Path(path).stem
-    chunks: list[str] = []
+    bounds: list[tuple[int, int]] = []
 
-    logger.info("Splitting audio into ~%ds chunks...", MAX_CHUNK_SECONDS)
+    logger.info("Splitting audio into ~%ds chunks...", chunk_seconds)
 
     pos = 0
     i = 0
     while pos < total_ms:
-        # If the remaining audio fits in one chunk, take it all.
-        if total_ms - pos <= chunk_target_ms:
+        # If the remaining audio (nearly) fits in one chunk, take it all.
+        if total_ms - pos <= chunk_target_ms * (1 + CHUNK_TAIL_TOLERANCE):
             end = total_ms
         else:
             target = pos + chunk_target_ms
-            silence_point = _find_silence_near(audio, target)
-            if silence_point is not None:
+            silence_point = _find_silence_near(samples, target)
+            # A point at or before `pos` would never advance the split.
+            if silence_point is not None and silence_point > pos:
                 end = silence_point
                 logger.debug(
                     "  Chunk %d: splitting at silence %0.1fs (target was %0.1fs)",
@@ -102,20 +242,27 @@ def split_audio(path: str) -> list[str]:
                     i + 1, end / 1000,
                 )
 
-        chunk = audio[pos:end]
-        chunk_path = str(TEMP_DIR / f"{base_name}_chunk_{i:03d}.mp3")
-        chunk.export(chunk_path, format="mp3")
-        chunks.append(chunk_path)
-
-        duration_s = (end - pos) / 1000
+        bounds.append((pos, end))
         logger.info(
             "  Chunk %d: %.1fs - %.1fs (%.1fs)",
-            i + 1, pos / 1000, end / 1000, duration_s,
+            i + 1, pos / 1000, end / 1000, (end - pos) / 1000,
         )
 
         pos = end
         i += 1
 
+    # "%" in the file name would be read as part of the segment pattern.
+    stem = base_name.replace("%", "%%")
+    _export_chunks(
+        path,
+        [start for start, _ in bounds[1:]],
+        str(out_dir / f"{stem}_chunk_%03d.mp3"),
+    )
+    chunks = [
+        (str(out_dir / f"{base_name}_chunk_{i:03d}.mp3"), (end - start) / 1000)
+        for i, (start, end) in enumerate(bounds)
+    ]
+
     logger.info("Created %d chunks", len(chunks))
     return chunks
 
@@ -124,7 +271,6 @@ def cleanup_files(paths: list[str]) -> None:
     """Remove a list of files, ignoring errors."""
     for p in paths:
         try:
-            if os.path.exists(p):
-                os.remove(p)
+            Path(p).unlink(missing_ok=True)
         except OSError:
             logger.debug("Failed to remove temp file: %s", p)
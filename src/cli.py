@@ -5,13 +5,12 @@ import json
 import os
 import sys
 import time
-
-from dotenv import load_dotenv
 from pathlib import Path
 
-from src.config import MAX_CHUNK_SECONDS, TEMP_DIR, TRANSCRIPTS_DIR
-from src.downloader import download_from_youtube, download_from_url
-from src.transcriber import transcribe
+# The downloader and transcriber pull in yt-dlp, replicate and NumPy, which
+# take a second or more to import; they are imported inside the functions
+# that need them so `--help` and argument errors return immediately.
+import src.config as cfg
 from src.utils import (
     DownloadError,
     TranscriptionError,
@@ -25,31 +24,42 @@ from src.utils import (
 )
 
 
-def _save_transcript(
-    text: str, source: str, video_metadata: dict | None = None
-) -> str:
-    """Save transcription text and metadata. Returns the text file path."""
+def _transcript_path(video_metadata: dict | None = None) -> Path:
+    """Pick the transcript text file path for this run."""
     stem = generate_filename(
         title=video_metadata.get("title") if video_metadata else None,
         video_id=video_metadata.get("id") if video_metadata else None,
     )
+    return cfg.TRANSCRIPTS_DIR / f"{stem}.txt"
 
-    text_path = TRANSCRIPTS_DIR / f"{stem}.txt"
-    meta_path = TRANSCRIPTS_DIR / f"{stem}.json"
 
-    text_path.write_text(text, encoding="utf-8")
+def _save_metadata(
+    text_path: Path,
+    word_count: int,
+    source: str,
+    video_metadata: dict | None = None,
+) -> None:
+    """Save transcript metadata as JSON next to the text file."""
     meta = {
         "source": source,
         "is_youtube": is_youtube_url(source),
-        "word_count": len(text.split()),
+        "word_count": word_count,
     }
     if video_metadata:
         meta["title"] = video_metadata.get("title")
         meta["video_id"] = video_metadata.get("id")
+    meta_path = text_path.with_suffix(".json")
     meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
 
-    logger.info("Saved: %s", text_path)
-    return str(text_path)
+
+def _report_partial(part_path: Path | None) -> None:
+    """After a failed run, keep a partial transcript or drop an empty one."""
+    if part_path is None or not part_path.exists():
+        return
+    if part_path.stat().st_size:
+        logger.info("Partial transcript kept: %s", part_path)
+    else:
+        part_path.unlink()
 
 
 def _resolve_audio(
@@ -59,6 +69,8 @@ def _resolve_audio(
 
     Returns (local_path, needs_cleanup, video_metadata).
     """
+    from src.downloader import download_from_url, download_from_youtube
+
     if is_youtube_url(source):
         path, metadata = download_from_youtube(
             source, cookies_from_browser=cookies_from_browser
@@ -90,13 +102,21 @@ def _build_parser() -> argparse.ArgumentParser:
         "-o", "--output-dir",
         type=Path,
         default=None,
-        help=f"Directory for transcript output (default: {TRANSCRIPTS_DIR})",
+        help=f"Directory for transcript output (default: {cfg.TRANSCRIPTS_DIR})",
     )
     parser.add_argument(
         "--max-chunk",
         type=int,
         default=None,
-        help=f"Max chunk duration in seconds (default: {MAX_CHUNK_SECONDS})",
+        help=f"Max chunk duration in seconds (default: {cfg.MAX_CHUNK_SECONDS})",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Max chunks transcribed at once; lower this if you hit "
+             f"Replicate rate limits (default: {cfg.MAX_PARALLEL_CHUNKS})",
     )
     parser.add_argument(
         "-v", "--verbose",
@@ -119,9 +139,18 @@ def main(argv: list[str] | None = None) -> None:
     """Main entry point."""
     parser = _build_parser()
     args = parser.parse_args(argv)
+    if args.max_chunk is not None and args.max_chunk <= cfg.SPLIT_WINDOW_SECONDS:
+        parser.error(
+            f"--max-chunk must be more than {cfg.SPLIT_WINDOW_SECONDS} seconds"
+        )
+
+    if args.parallel is not None and args.parallel < 1:
+        parser.error("--parallel must be at least 1")
 
     setup_logging(verbose=args.verbose)
-    load_dotenv()
+    if not os.environ.get("REPLICATE_API_TOKEN"):
+        from dotenv import load_dotenv
+        load_dotenv()
 
     if not os.environ.get("REPLICATE_API_TOKEN"):
         logger.error(
@@ -130,18 +159,23 @@ def main(argv: list[str] | None = None) -> None:
         )
         sys.exit(1)
 
-    # Apply overrides from CLI flags.
+    # Apply overrides from CLI flags.  The modules that use these read them
+    # from src.config at call time.
     if args.output_dir is not None:
-        import src.config as cfg
         cfg.TRANSCRIPTS_DIR = args.output_dir
 
     if args.max_chunk is not None:
-        import src.config as cfg
         cfg.MAX_CHUNK_SECONDS = args.max_chunk
 
+    if args.parallel is not None:
+        cfg.MAX_PARALLEL_CHUNKS = args.parallel
+
+    from src.audio import cleanup_files
+    from src.transcriber import transcribe
+
     # Ensure directories exist.
-    TEMP_DIR.mkdir(exist_ok=True)
-    TRANSCRIPTS_DIR.mkdir(exist_ok=True)
+    cfg.TEMP_DIR.mkdir(exist_ok=True)
+    cfg.TRANSCRIPTS_DIR.mkdir(exist_ok=True)
 
     # Get the source URL / path.
     source = args.url
@@ -159,28 +193,39 @@ def main(argv: list[str] | None = None) -> None:
     audio_path: str | None = None
     needs_cleanup = False
     video_metadata = None
+    part_path: Path | None = None
 
     try:
         audio_path, needs_cleanup, video_metadata = _resolve_audio(
             source, cookies_from_browser=args.cookies_from_browser
         )
 
+        # The transcript is written to a ".part" file as chunks complete
+        # and only replaces an earlier transcript once the run succeeds.
+        text_path = _transcript_path(video_metadata)
+        part_path = text_path.with_name(text_path.name + ".part")
         start = time.time()
-        text = transcribe(audio_path)
+        with open(part_path, "w", encoding="utf-8") as out:
+            word_count = transcribe(audio_path, out)
+        os.replace(part_path, text_path)
+        part_path = None
         elapsed = time.time() - start
         logger.info("Completed in %.1fs", elapsed)
 
-        _save_transcript(text, source, video_metadata)
+        _save_metadata(text_path, word_count, source, video_metadata)
+        logger.info("Saved: %s", text_path)
 
     except (DownloadError, TranscriptionError, AudioProcessingError) as e:
         logger.error("Error: %s", e)
+        _report_partial(part_path)
         sys.exit(1)
     except KeyboardInterrupt:
         logger.info("\nInterrupted")
+        _report_partial(part_path)
         sys.exit(130)
     finally:
-        if audio_path and needs_cleanup and os.path.exists(audio_path):
-            os.remove(audio_path)
+        if audio_path and needs_cleanup:
+            cleanup_files([audio_path])
             logger.debug("Cleaned up temp file: %s", audio_path)
 
 
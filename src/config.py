@@ -11,23 +11,49 @@ TRANSCRIPTS_DIR = Path("transcripts")
 # even for fast speakers (~200 wpm = ~1000 words in 5 min).
 MAX_CHUNK_SECONDS = 300
 
+# A chunk may run this fraction past MAX_CHUNK_SECONDS rather than leave a
+# short tail that would need its own API call.
+CHUNK_TAIL_TOLERANCE = 0.2
+
 # Window (in seconds) around the target split point to search for silence.
 SPLIT_WINDOW_SECONDS = 30
 
-# pydub silence detection parameters
+# Silence detection parameters
 SILENCE_THRESH_DB = -40  # dBFS threshold to consider as silence
 MIN_SILENCE_MS = 400     # minimum silence length to be a valid split point
-
-# Audio download quality (kbps)
-AUDIO_QUALITY = "192"
+# Audio is decoded to mono PCM at this rate for detection. An RMS threshold
+# doesn't need the full bandwidth, and 8kHz moves half the bytes of 16kHz.
+SILENCE_SAMPLE_RATE = 8000
+
+# Audio encoding for YouTube downloads and re-encoded chunks.  Speech
+# recognition only needs 16kHz mono; at 48 kbps a 5-minute chunk is ~1.8 MB
+# to upload instead of ~7 MB at 192 kbps stereo.
+AUDIO_QUALITY = "48"  # kbps
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_CHANNELS = 1
+
+# YouTube download tuning: fetch DASH fragments over parallel connections,
+# and request unfragmented streams in ranged chunks.
+DOWNLOAD_CONCURRENT_FRAGMENTS = 8
+DOWNLOAD_HTTP_CHUNK_SIZE = 10 * 1024 * 1024  # bytes
+DOWNLOAD_RETRIES = 5
 
 # Replicate model
 DEFAULT_MODEL = "openai/gpt-4o-transcribe"
 TRANSCRIPTION_TEMPERATURE = 0
 
+# Number of chunks transcribed concurrently. Each chunk is an independent
+# API request; lower this if you hit Replicate rate limits.
+MAX_PARALLEL_CHUNKS = 4
+
 # Retry settings for API calls
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 2  # seconds; doubles each attempt (2s, 4s, 8s)
+RETRY_JITTER = 1      # up to this many seconds of random delay added to each wait
+
+# Upper bound on a single API response. A 5-minute chunk is a few thousand
+# characters; anything far beyond that is a runaway output.
+MAX_TRANSCRIPT_CHARS = 50_000
 
 # Truncation detection
 # If actual words < expected words * this ratio, warn about possible truncation.
@@ -1,10 +1,21 @@
 """Audio download: YouTube via yt-dlp, direct URLs via requests."""
 
+import shutil
+
 import requests
+import urllib3
 import yt_dlp
 from pathlib import Path
 
-from src.config import AUDIO_QUALITY, TEMP_DIR
+from src.config import (
+    AUDIO_CHANNELS,
+    AUDIO_QUALITY,
+    AUDIO_SAMPLE_RATE,
+    DOWNLOAD_CONCURRENT_FRAGMENTS,
+    DOWNLOAD_HTTP_CHUNK_SIZE,
+    DOWNLOAD_RETRIES,
+    TEMP_DIR,
+)
 from src.utils import DownloadError, logger
 
 
@@ -26,7 +37,16 @@ def download_from_youtube(
                 "preferredquality": AUDIO_QUALITY,
             }
         ],
+        "postprocessor_args": {
+            "extractaudio": [
+                "-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS),
+            ],
+        },
         "outtmpl": str(TEMP_DIR / "%(title)s.%(ext)s"),
+        "concurrent_fragment_downloads": DOWNLOAD_CONCURRENT_FRAGMENTS,
+        "http_chunk_size": DOWNLOAD_HTTP_CHUNK_SIZE,
+        "retries": DOWNLOAD_RETRIES,
+        "fragment_retries": DOWNLOAD_RETRIES,
         "quiet": True,
         "no_warnings": True,
     }
@@ -76,12 +96,15 @@ def download_from_url(url: str) -> str:
                     "URL content-type is '%s' — may not be an audio file", ct
                 )
 
+            # Copy straight from the urllib3 stream in 1 MiB blocks,
+            # undoing any Content-Encoding on the way.  Read errors here
+            # are raw urllib3 exceptions, not RequestException.
+            resp.raw.decode_content = True
             with open(dest, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                shutil.copyfileobj(resp.raw, f, length=1 << 20)
 
         logger.info("Downloaded: %s", dest)
         return str(dest)
 
-    except requests.RequestException as e:
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
         raise DownloadError(f"URL download failed: {e}") from e
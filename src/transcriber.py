@@ -1,71 +1,162 @@
 """Transcription via Replicate API with retry logic and truncation detection."""
 
-import time
+import io
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import NoReturn, TextIO
 
 import replicate
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
-from src.audio import cleanup_files, get_duration_seconds, split_audio
+import src.config as cfg
+from src.audio import get_duration_seconds, split_audio
 from src.config import (
+    CHUNK_TAIL_TOLERANCE,
     DEFAULT_MODEL,
     EXPECTED_WORDS_PER_SECOND,
-    MAX_CHUNK_SECONDS,
     MAX_RETRIES,
+    MAX_TRANSCRIPT_CHARS,
     RETRY_BASE_DELAY,
+    RETRY_JITTER,
+    TEMP_DIR,
     TRANSCRIPTION_TEMPERATURE,
     TRUNCATION_WARN_RATIO,
 )
 from src.utils import TranscriptionError, logger
 
+# One client for every request, so its HTTP connection pool (and the TLS
+# sessions in it) is reused across uploads and chunks.  The API token is
+# read from the environment on first use.
+_client = replicate.Client()
 
-def _transcribe_file(path: str) -> str:
-    """Transcribe a single audio file via the Replicate API.
 
-    Retries up to MAX_RETRIES times with exponential backoff on transient
-    failures.  Raises TranscriptionError on permanent failure.
-    """
-    last_err: Exception | None = None
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            with open(path, "rb") as f:
-                output = replicate.run(
-                    DEFAULT_MODEL,
-                    input={"audio_file": f, "temperature": TRANSCRIPTION_TEMPERATURE},
-                )
-
-            if output is None:
-                raise TranscriptionError("API returned no response")
-
-            tokens = list(output)
-            text = "".join(tokens)
-
-            if not text.strip():
-                raise TranscriptionError("API returned empty transcription")
-
-            return text
-
-        except TranscriptionError:
-            raise  # don't retry on clearly bad responses
-        except Exception as e:
-            last_err = e
-            if attempt < MAX_RETRIES:
-                delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
-                logger.warning(
-                    "  Attempt %d/%d failed (%s), retrying in %ds...",
-                    attempt, MAX_RETRIES, e, delay,
-                )
-                time.sleep(delay)
-            else:
-                logger.error("  All %d attempts failed", MAX_RETRIES)
+def _log_retry(state: RetryCallState) -> None:
+    logger.warning(
+        "  Attempt %d/%d failed (%s), retrying in %.0fs...",
+        state.attempt_number, MAX_RETRIES,
+        state.outcome.exception(), state.next_action.sleep,
+    )
 
+
+def _retries_exhausted(state: RetryCallState) -> NoReturn:
+    logger.error("  All %d attempts failed", MAX_RETRIES)
     raise TranscriptionError(
-        f"Transcription failed after {MAX_RETRIES} attempts: {last_err}"
+        f"Transcription failed after {MAX_RETRIES} attempts: "
+        f"{state.outcome.exception()}"
+    )
+
+
+# Retries transient failures with jittered exponential backoff.
+# TranscriptionError means a clearly bad response and is never retried;
+# neither are KeyboardInterrupt and other non-Exception errors.
+_with_retries = retry(
+    stop=stop_after_attempt(MAX_RETRIES),
+    wait=(
+        wait_exponential(multiplier=RETRY_BASE_DELAY)
+        + wait_random(0, RETRY_JITTER)
+    ),
+    retry=(
+        retry_if_exception_type(Exception)
+        & retry_if_not_exception_type(TranscriptionError)
+    ),
+    before_sleep=_log_retry,
+    retry_error_callback=_retries_exhausted,
+)
+
+
+@_with_retries
+def _upload(path: str):
+    """Upload a file to Replicate's file storage."""
+    return _client.files.create(path)
+
+
+def _delete_upload(file_id: str) -> None:
+    """Remove an uploaded file from Replicate, ignoring errors."""
+    try:
+        _client.files.delete(file_id)
+    except Exception:
+        logger.debug("Failed to delete uploaded file: %s", file_id)
+
+
+@_with_retries
+def _run_model(file_url: str) -> tuple[str, int]:
+    """Run the transcription model on an uploaded file.
+
+    Returns (text, word_count); words are counted as tokens stream in.
+    """
+    output = _client.run(
+        DEFAULT_MODEL,
+        input={"audio_file": file_url, "temperature": TRANSCRIPTION_TEMPERATURE},
     )
 
+    if output is None:
+        raise TranscriptionError("API returned no response")
+
+    buf = io.StringIO()
+    total = 0
+    words = 0
+    in_word = False
+    for token in output:
+        buf.write(token)
+        total += len(token)
+        if total > MAX_TRANSCRIPT_CHARS:
+            raise TranscriptionError(
+                f"API output exceeded {MAX_TRANSCRIPT_CHARS} characters"
+            )
+        if not token:
+            continue
+        words += len(token.split())
+        # A word split across two tokens was counted twice.
+        if in_word and not token[0].isspace():
+            words -= 1
+        in_word = not token[-1].isspace()
+    text = buf.getvalue()
+
+    if not text.strip():
+        raise TranscriptionError("API returned empty transcription")
+
+    return text, words
+
+
+def _transcribe_file(path: str) -> tuple[str, int]:
+    """Transcribe a single audio file via the Replicate API.
+
+    Returns (text, word_count).
+
+    The file is uploaded to Replicate's file storage once and passed to the
+    model by URL, so retries only re-run the prediction.  Both steps retry
+    up to MAX_RETRIES times with exponential backoff on transient failures.
+    Raises TranscriptionError on permanent failure.
+    """
+    uploaded = _upload(path)
+    try:
+        return _run_model(uploaded.urls["get"])
+    finally:
+        _delete_upload(uploaded.id)
+
+
+def _check_truncation(
+    text: str,
+    chunk_duration_s: float,
+    chunk_index: int,
+    word_count: int | None = None,
+) -> None:
+    """Warn if a chunk transcription appears truncated.
 
-def _check_truncation(text: str, chunk_duration_s: float, chunk_index: int) -> None:
-    """Warn if a chunk transcription appears truncated."""
-    word_count = len(text.split())
+    Pass `word_count` when it is already known to skip re-splitting `text`.
+    """
+    if word_count is None:
+        word_count = len(text.split())
     expected_words = chunk_duration_s * EXPECTED_WORDS_PER_SECOND
     ratio = word_count / expected_words if expected_words > 0 else 1.0
 
@@ -85,33 +176,76 @@ def _check_truncation(text: str, chunk_duration_s: float, chunk_index: int) -> N
         )
 
 
-def transcribe(audio_path: str) -> str:
-    """Transcribe an audio file, splitting into chunks if needed.
+def _transcribe_chunks(chunks: list[tuple[str, float]], out: TextIO) -> int:
+    """Transcribe (path, duration_s) chunks concurrently into `out`.
 
-    Returns the full transcription text.
+    Each chunk is written (and flushed) as soon as every chunk before it is
+    done, so a crash part-way keeps the transcript so far.  Only chunks that
+    finish ahead of an earlier one are held in memory.
+    Returns the total word count.
+    """
+    pending: dict[int, str] = {}
+    next_index = 0
+    word_count = 0
+
+    def _transcribe_chunk(
+        i: int, chunk_path: str, chunk_dur: float
+    ) -> tuple[str, int]:
+        logger.info("Transcribing chunk %d/%d...", i + 1, len(chunks))
+        text, words = _transcribe_file(chunk_path)
+        _check_truncation(text, chunk_dur, i, words)
+        return text, words
+
+    # Read at call time so a --parallel override always applies.
+    workers = max(1, min(len(chunks), cfg.MAX_PARALLEL_CHUNKS))
+    ex = ThreadPoolExecutor(max_workers=workers)
+    futures = {
+        ex.submit(_transcribe_chunk, i, chunk_path, chunk_dur): i
+        for i, (chunk_path, chunk_dur) in enumerate(chunks)
+    }
+    try:
+        for future in as_completed(futures):
+            text, words = future.result()
+            pending[futures[future]] = text
+            word_count += words
+
+            while next_index in pending:
+                if next_index > 0:
+                    out.write("\n\n")
+                out.write(pending.pop(next_index))
+                next_index += 1
+            out.flush()
+    except BaseException:
+        # Once a chunk fails (or on Ctrl-C), drop the queued chunks and
+        # return without waiting for the ones already in flight.
+        ex.shutdown(wait=False, cancel_futures=True)
+        raise
+    ex.shutdown()
+
+    return word_count
+
+
+def transcribe(audio_path: str, out: TextIO) -> int:
+    """Transcribe an audio file into `out`, splitting into chunks if needed.
+
+    Returns the transcript's word count.
     """
     duration = get_duration_seconds(audio_path)
     logger.info("Duration: %.0fs (%.1f min)", duration, duration / 60)
 
     # Short file — transcribe directly.
-    if duration <= MAX_CHUNK_SECONDS:
+    if duration <= cfg.MAX_CHUNK_SECONDS * (1 + CHUNK_TAIL_TOLERANCE):
         logger.info("Transcribing...")
-        text = _transcribe_file(audio_path)
-        _check_truncation(text, duration, 0)
-        return text
-
-    # Long file — split and transcribe each chunk.
-    chunks = split_audio(audio_path)
-    transcriptions: list[str] = []
-
+        text, words = _transcribe_file(audio_path)
+        _check_truncation(text, duration, 0, words)
+        out.write(text)
+        return words
+
+    # Long file — split into a per-run directory and transcribe chunks
+    # concurrently.  The directory is removed in one go when done.
+    TEMP_DIR.mkdir(exist_ok=True)
+    run_dir = Path(tempfile.mkdtemp(prefix="chunks_", dir=TEMP_DIR))
     try:
-        for i, chunk_path in enumerate(chunks):
-            logger.info("Transcribing chunk %d/%d...", i + 1, len(chunks))
-            chunk_dur = get_duration_seconds(chunk_path)
-            text = _transcribe_file(chunk_path)
-            _check_truncation(text, chunk_dur, i)
-            transcriptions.append(text)
+        return _transcribe_chunks(split_audio(audio_path, run_dir), out)
     finally:
-        cleanup_files(chunks)
-
-    return "\n\n".join(transcriptions)
+        shutil.rmtree(run_dir, ignore_errors=True)
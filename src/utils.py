@@ -1,14 +1,28 @@
 """Utility functions: logging, validation, file naming."""
 
+import itertools
 import logging
-import random
 import re
-import string
+import secrets
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse
 
 logger = logging.getLogger("transcribe")
 
+# YouTube URLs on the bare domain or any subdomain (www., m., music., ...);
+# lookalike hosts such as "notyoutube.com" don't match.
+_YT_RE = re.compile(
+    r"^https?://(?:[\w-]+\.)*(?:youtube\.com|youtu\.be)(?::\d+)?(?:[/?#]|$)",
+    re.IGNORECASE,
+)
+
+# Runs of characters replaced by a hyphen in slugs.
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Appended to random filename suffixes so names stay unique within a process.
+_filename_counter = itertools.count()
+
 
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging for the application."""
@@ -23,18 +37,13 @@ def setup_logging(verbose: bool = False) -> None:
     root.addHandler(handler)
 
 
+@lru_cache(maxsize=128)
 def is_youtube_url(url: str) -> bool:
     """Check if URL is from YouTube."""
-    try:
-        parsed = urlparse(url)
-        return any(
-            d in parsed.netloc
-            for d in ["youtube.com", "youtu.be", "www.youtube.com"]
-        )
-    except Exception:
-        return False
+    return bool(_YT_RE.match(url))
 
 
+@lru_cache(maxsize=128)
 def is_remote_url(url: str) -> bool:
     """Check if a string is an HTTP/HTTPS URL."""
     try:
@@ -50,7 +59,7 @@ def slugify(text: str, max_length: int = 50) -> str:
     Lowercases, replaces non-alphanumeric chars with hyphens, and trims.
     """
     text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = _SLUG_RE.sub("-", text)
     text = text.strip("-")
     return text[:max_length].rstrip("-")
 
@@ -75,9 +84,9 @@ def generate_filename(
             parts.append(slugify(title))
         return "_".join(parts)
 
-    # Fallback: timestamp + random suffix
+    # Fallback: timestamp + random suffix + in-process counter
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
+    suffix = f"{secrets.token_hex(2)}{next(_filename_counter) & 0xff:02x}"
     return f"{prefix}_{timestamp}_{suffix}"
 
 
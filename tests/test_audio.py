@@ -2,13 +2,23 @@
 
 import os
 import math
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 from pydub import AudioSegment
 from pydub.generators import Sine, WhiteNoise
 
-from src.audio import get_duration_seconds, split_audio, cleanup_files, _find_silence_near
-from src.config import TEMP_DIR
+from src.audio import (
+    get_duration_seconds,
+    split_audio,
+    cleanup_files,
+    _decode_pcm,
+    _export_chunks,
+    _find_silence_near,
+)
+from src.config import SILENCE_SAMPLE_RATE, TEMP_DIR
+from src.utils import AudioProcessingError
 
 
 @pytest.fixture(autouse=True)
@@ -52,41 +62,124 @@ class TestGetDurationSeconds:
         with pytest.raises(Exception):
             get_duration_seconds("/nonexistent/file.mp3")
 
+    def test_mp3_read_from_headers(self, short_audio):
+        """MP3 duration comes from the frame headers, without ffprobe."""
+        with patch("src.audio.subprocess.check_output") as mock_probe:
+            dur = get_duration_seconds(short_audio)
+        mock_probe.assert_not_called()
+        assert abs(dur - 10.0) < 0.5
+
+
+class TestDecodePcm:
+    def test_mono_int16_at_detection_rate(self, short_audio):
+        samples = _decode_pcm(short_audio)
+        assert samples.dtype == np.int16
+        assert samples.ndim == 1
+        assert abs(len(samples) / SILENCE_SAMPLE_RATE - 10.0) < 0.5
+
+    def test_nonexistent_file(self):
+        with pytest.raises(AudioProcessingError):
+            _decode_pcm("/nonexistent/file.mp3")
+
+    def test_error_includes_ffmpeg_message(self, tmp_path):
+        """The decoder's own diagnostic is kept, not just the exit status."""
+        path = tmp_path / "garbage.mp3"
+        path.write_bytes(b"not audio" * 100)
+        with pytest.raises(AudioProcessingError, match="Invalid data"):
+            _decode_pcm(str(path))
+
 
 class TestFindSilenceNear:
-    def test_finds_silence(self):
+    def test_finds_silence(self, tmp_path):
         """Should find the silence gap in a tone-silence-tone pattern."""
         tone = Sine(440).to_audio_segment(duration=5000)
         silence = AudioSegment.silent(duration=1000)
         audio = tone + silence + tone  # 5s tone, 1s silence, 5s tone
+        path = str(tmp_path / "gap.wav")
+        audio.export(path, format="wav")
 
         # Target is at 6000ms (middle of the audio); silence is at 5000-6000ms.
-        result = _find_silence_near(audio, target_ms=6000)
+        result = _find_silence_near(_decode_pcm(path), target_ms=6000)
         assert result is not None
         # The midpoint of the silence should be near 5500ms.
         assert abs(result - 5500) < 500
 
-    def test_no_silence(self):
+    def test_finds_distant_silence(self, tmp_path):
+        """Silence outside the first search radius is found by widening it."""
+        tone = Sine(440).to_audio_segment(duration=20_000)
+        silence = AudioSegment.silent(duration=1000)
+        audio = tone + silence + tone  # silence at 20-21s
+        path = str(tmp_path / "far_gap.wav")
+        audio.export(path, format="wav")
+
+        result = _find_silence_near(_decode_pcm(path), target_ms=40_000)
+        assert result is not None
+        assert abs(result - 20_500) < 500
+
+    def test_no_silence(self, tmp_path):
         """Should return None when there is no silence in the window."""
         tone = Sine(440).to_audio_segment(duration=10_000)
-        result = _find_silence_near(tone, target_ms=5000)
+        path = str(tmp_path / "tone.wav")
+        tone.export(path, format="wav")
+
+        result = _find_silence_near(_decode_pcm(path), target_ms=5000)
         assert result is None
 
 
+class TestExportChunks:
+    def test_non_mp3_named_mp3_is_reencoded(self, tmp_path):
+        """AAC content saved with an .mp3 name is encoded, not stream-copied."""
+        tone = Sine(440).to_audio_segment(duration=5000)
+        src = str(tmp_path / "audio_download.mp3")
+        tone.export(src, format="adts")
+
+        pattern = str(tmp_path / "chunk_%03d.mp3")
+        _export_chunks(src, [2000], pattern)
+
+        for i in range(2):
+            assert get_duration_seconds(pattern % i) > 0
+
+
+    def test_error_includes_ffmpeg_message(self, tmp_path):
+        """ffmpeg's diagnostic is kept, not just the exit status."""
+        src = tmp_path / "garbage.wav"
+        src.write_bytes(b"not audio" * 100)
+        with pytest.raises(AudioProcessingError, match="Invalid data"):
+            _export_chunks(str(src), [2000], str(tmp_path / "chunk_%03d.mp3"))
+
 class TestSplitAudio:
     def test_splits_long_file(self, long_audio_with_silence):
         chunks = split_audio(long_audio_with_silence)
         try:
             assert len(chunks) >= 2
             # All chunk files should exist.
-            for c in chunks:
+            for c, _ in chunks:
                 assert os.path.isfile(c)
             # Total duration of chunks should roughly equal the original.
-            total = sum(get_duration_seconds(c) for c in chunks)
+            total = sum(dur for _, dur in chunks)
             original = get_duration_seconds(long_audio_with_silence)
             assert abs(total - original) < 2.0  # within 2s
         finally:
-            cleanup_files(chunks)
+            cleanup_files([c for c, _ in chunks])
+
+    def test_reported_durations_match_files(self, long_audio_with_silence):
+        """Durations returned with each chunk match the exported files."""
+        chunks = split_audio(long_audio_with_silence)
+        try:
+            for path, dur in chunks:
+                assert abs(get_duration_seconds(path) - dur) < 0.5
+        finally:
+            cleanup_files([c for c, _ in chunks])
+
+    @patch("src.config.MAX_CHUNK_SECONDS", 3)
+    @patch("src.audio._find_silence_near", return_value=0)
+    def test_silence_before_chunk_start_is_ignored(self, mock_silence, short_audio):
+        """Silence at or before the chunk start falls back to a hard cut."""
+        chunks = split_audio(short_audio)
+        try:
+            assert [round(dur) for _, dur in chunks] == [3, 3, 3, 1]
+        finally:
+            cleanup_files([c for c, _ in chunks])
 
 
 class TestCleanupFiles:
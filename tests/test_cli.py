@@ -0,0 +1,105 @@
+"""Tests for src.cli."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+import src.config as cfg
+import src.transcriber
+from src.cli import main
+from src.utils import TranscriptionError
+
+
+@pytest.fixture
+def cli_env(tmp_path, monkeypatch):
+    """Run the CLI against a local file, restoring any config it overrides."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("REPLICATE_API_TOKEN", "test-token")
+    for name in ("TRANSCRIPTS_DIR", "MAX_CHUNK_SECONDS", "MAX_PARALLEL_CHUNKS"):
+        monkeypatch.setattr(cfg, name, getattr(cfg, name))
+
+    audio = tmp_path / "talk.mp3"
+    audio.write_bytes(b"fake audio data")
+    return audio
+
+
+class TestOverrides:
+    @patch("src.transcriber._transcribe_file", return_value=("Text.", 1))
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds", return_value=1200.0)
+    def test_parallel(self, mock_duration, mock_split, mock_transcribe, cli_env):
+        """--parallel applies even though src.transcriber is already imported."""
+        mock_split.return_value = [(f"chunk_{i}.mp3", 300.0) for i in range(4)]
+        pools = []
+
+        def record_pool(max_workers):
+            pools.append(max_workers)
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        with patch("src.transcriber.ThreadPoolExecutor", side_effect=record_pool):
+            main([str(cli_env), "--parallel", "1"])
+        assert pools == [1]
+
+    @patch("src.transcriber._transcribe_file", return_value=("Text.", 1))
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds", return_value=100.0)
+    def test_max_chunk(self, mock_duration, mock_split, mock_transcribe, cli_env):
+        """--max-chunk applies even though src.transcriber is already imported."""
+        seen = []
+
+        def fake_split(path, out_dir):
+            seen.append(cfg.MAX_CHUNK_SECONDS)
+            return [("chunk_0.mp3", 60.0), ("chunk_1.mp3", 40.0)]
+
+        mock_split.side_effect = fake_split
+
+        main([str(cli_env), "--max-chunk", "60"])
+        assert seen == [60]
+
+    def test_max_chunk_within_split_window_rejected(self, cli_env):
+        with pytest.raises(SystemExit) as exc:
+            main([str(cli_env), "--max-chunk", str(cfg.SPLIT_WINDOW_SECONDS)])
+        assert exc.value.code == 2
+
+
+class TestTranscriptOutput:
+    @patch("src.transcriber.transcribe")
+    def test_success_renames_part_file(self, mock_transcribe, cli_env):
+        def fake_transcribe(path, out):
+            out.write("Hello world.")
+            return 2
+
+        mock_transcribe.side_effect = fake_transcribe
+
+        main([str(cli_env), "-o", "out"])
+
+        out_dir = cli_env.parent / "out"
+        (text_path,) = out_dir.glob("*.txt")
+        assert text_path.read_text(encoding="utf-8") == "Hello world."
+        assert text_path.with_suffix(".json").exists()
+        assert not list(out_dir.glob("*.part"))
+
+    @patch("src.transcriber.transcribe")
+    def test_failure_keeps_partial_transcript(self, mock_transcribe, cli_env):
+        def fake_transcribe(path, out):
+            out.write("First chunk.")
+            raise TranscriptionError("boom")
+
+        mock_transcribe.side_effect = fake_transcribe
+
+        with pytest.raises(SystemExit) as exc:
+            main([str(cli_env), "-o", "out"])
+        assert exc.value.code == 1
+
+        out_dir = cli_env.parent / "out"
+        (part_path,) = out_dir.glob("*.txt.part")
+        assert part_path.read_text(encoding="utf-8") == "First chunk."
+        assert not list(out_dir.glob("*.txt"))
+        assert not list(out_dir.glob("*.json"))
+
+    @patch("src.transcriber.transcribe", side_effect=TranscriptionError("boom"))
+    def test_failure_removes_empty_part_file(self, mock_transcribe, cli_env):
+        with pytest.raises(SystemExit):
+            main([str(cli_env), "-o", "out"])
+        assert not list((cli_env.parent / "out").iterdir())
@@ -1,5 +1,6 @@
 """Tests for src.downloader."""
 
+import io
 from unittest.mock import MagicMock, patch, mock_open
 
 import pytest
@@ -56,6 +57,35 @@ class TestDownloadFromYoutube:
         opts = call_args[0][0]
         assert opts["cookiesfrombrowser"] == ("chrome",)
 
+    @patch("src.downloader.yt_dlp.YoutubeDL")
+    def test_parallel_fragment_options(self, mock_ydl_cls):
+        mock_ydl = MagicMock()
+        mock_ydl_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
+        mock_ydl_cls.return_value.__exit__ = MagicMock(return_value=False)
+        mock_ydl.extract_info.return_value = {"title": "T", "id": "t"}
+        mock_ydl.prepare_filename.return_value = "temp/T.webm"
+
+        download_from_youtube("https://www.youtube.com/watch?v=test")
+
+        opts = mock_ydl_cls.call_args[0][0]
+        assert opts["concurrent_fragment_downloads"] > 1
+        assert opts["http_chunk_size"] > 0
+
+    @patch("src.downloader.yt_dlp.YoutubeDL")
+    def test_downsamples_for_speech(self, mock_ydl_cls):
+        mock_ydl = MagicMock()
+        mock_ydl_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
+        mock_ydl_cls.return_value.__exit__ = MagicMock(return_value=False)
+        mock_ydl.extract_info.return_value = {"title": "T", "id": "t"}
+        mock_ydl.prepare_filename.return_value = "temp/T.webm"
+
+        download_from_youtube("https://www.youtube.com/watch?v=test")
+
+        opts = mock_ydl_cls.call_args[0][0]
+        args = opts["postprocessor_args"]["extractaudio"]
+        assert args[args.index("-ac") + 1] == "1"
+        assert args[args.index("-ar") + 1] == "16000"
+
 
 class TestDownloadFromUrl:
     @patch("src.downloader.requests.get")
@@ -63,7 +93,7 @@ class TestDownloadFromUrl:
         # Mock the streaming response.
         mock_resp = MagicMock()
         mock_resp.headers = {"content-type": "audio/mpeg"}
-        mock_resp.iter_content.return_value = [b"fake audio bytes"]
+        mock_resp.raw = io.BytesIO(b"fake audio bytes")
         mock_resp.__enter__ = MagicMock(return_value=mock_resp)
         mock_resp.__exit__ = MagicMock(return_value=False)
         mock_get.return_value = mock_resp
@@ -73,6 +103,8 @@ class TestDownloadFromUrl:
             result = download_from_url("https://example.com/podcast.mp3")
 
         assert result.endswith("podcast.mp3")
+        with open(result, "rb") as f:
+            assert f.read() == b"fake audio bytes"
 
     @patch("src.downloader.requests.get")
     def test_failure_raises(self, mock_get):
@@ -81,3 +113,19 @@ class TestDownloadFromUrl:
 
         with pytest.raises(DownloadError, match="URL download failed"):
             download_from_url("https://example.com/bad.mp3")
+
+    @patch("src.downloader.requests.get")
+    def test_stream_error_mid_copy_raises(self, mock_get, tmp_path):
+        """A connection reset while copying the body becomes a DownloadError."""
+        from urllib3.exceptions import ProtocolError
+
+        mock_resp = MagicMock()
+        mock_resp.headers = {"content-type": "audio/mpeg"}
+        mock_resp.raw.read.side_effect = ProtocolError("Connection reset")
+        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
+        mock_resp.__exit__ = MagicMock(return_value=False)
+        mock_get.return_value = mock_resp
+
+        with patch("src.downloader.TEMP_DIR", tmp_path):
+            with pytest.raises(DownloadError, match="URL download failed"):
+                download_from_url("https://example.com/podcast.mp3")
@@ -1,15 +1,22 @@
 """Tests for src.transcriber."""
 
+import io
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.transcriber import _transcribe_file, _check_truncation
+from src.transcriber import (
+    _transcribe_file,
+    _check_truncation,
+    transcribe,
+)
 from src.utils import TranscriptionError
 
 
 class TestTranscribeFile:
-    @patch("src.transcriber.replicate")
+    @patch("src.transcriber._client")
     def test_success(self, mock_replicate, tmp_path):
         """Successful API call returns joined tokens."""
         audio = tmp_path / "test.mp3"
@@ -17,10 +24,23 @@ class TestTranscribeFile:
 
         mock_replicate.run.return_value = iter(["Hello ", "world."])
 
-        result = _transcribe_file(str(audio))
-        assert result == "Hello world."
+        text, words = _transcribe_file(str(audio))
+        assert text == "Hello world."
+        assert words == 2
 
-    @patch("src.transcriber.replicate")
+    @patch("src.transcriber._client")
+    def test_word_count_across_token_boundaries(self, mock_replicate, tmp_path):
+        """Words split across tokens are counted once."""
+        audio = tmp_path / "test.mp3"
+        audio.write_bytes(b"fake audio data")
+
+        tokens = ["Hel", "lo there", " ", "gen", "eral\nKen", "obi."]
+        mock_replicate.run.return_value = iter(tokens)
+
+        text, words = _transcribe_file(str(audio))
+        assert words == len(text.split()) == 4
+
+    @patch("src.transcriber._client")
     def test_empty_response_raises(self, mock_replicate, tmp_path):
         audio = tmp_path / "test.mp3"
         audio.write_bytes(b"fake audio data")
@@ -30,7 +50,7 @@ class TestTranscribeFile:
         with pytest.raises(TranscriptionError, match="empty"):
             _transcribe_file(str(audio))
 
-    @patch("src.transcriber.replicate")
+    @patch("src.transcriber._client")
     def test_none_response_raises(self, mock_replicate, tmp_path):
         audio = tmp_path / "test.mp3"
         audio.write_bytes(b"fake audio data")
@@ -40,8 +60,20 @@ class TestTranscribeFile:
         with pytest.raises(TranscriptionError, match="no response"):
             _transcribe_file(str(audio))
 
-    @patch("src.transcriber.time.sleep")  # don't actually sleep in tests
-    @patch("src.transcriber.replicate")
+    @patch("src.transcriber.MAX_TRANSCRIPT_CHARS", 10)
+    @patch("src.transcriber._client")
+    def test_runaway_output_raises(self, mock_replicate, tmp_path):
+        audio = tmp_path / "test.mp3"
+        audio.write_bytes(b"fake audio data")
+
+        mock_replicate.run.return_value = iter(["Hello ", "world ", "again."])
+
+        with pytest.raises(TranscriptionError, match="exceeded"):
+            _transcribe_file(str(audio))
+        assert mock_replicate.run.call_count == 1
+
+    @patch("tenacity.nap.time.sleep")  # don't actually sleep in tests
+    @patch("src.transcriber._client")
     def test_retries_on_transient_error(self, mock_replicate, mock_sleep, tmp_path):
         """Should retry and succeed on the second attempt."""
         audio = tmp_path / "test.mp3"
@@ -52,12 +84,12 @@ class TestTranscribeFile:
             iter(["Recovered ", "text."]),
         ]
 
-        result = _transcribe_file(str(audio))
-        assert result == "Recovered text."
+        text, _ = _transcribe_file(str(audio))
+        assert text == "Recovered text."
         assert mock_replicate.run.call_count == 2
 
-    @patch("src.transcriber.time.sleep")
-    @patch("src.transcriber.replicate")
+    @patch("tenacity.nap.time.sleep")
+    @patch("src.transcriber._client")
     def test_exhausts_retries(self, mock_replicate, mock_sleep, tmp_path):
         """Should raise after all retry attempts are exhausted."""
         audio = tmp_path / "test.mp3"
@@ -68,6 +100,40 @@ class TestTranscribeFile:
         with pytest.raises(TranscriptionError, match="3 attempts"):
             _transcribe_file(str(audio))
 
+    @patch("tenacity.nap.time.sleep")
+    @patch("src.transcriber._client")
+    def test_interrupt_not_retried(self, mock_replicate, mock_sleep, tmp_path):
+        """Ctrl-C propagates immediately instead of being retried."""
+        audio = tmp_path / "test.mp3"
+        audio.write_bytes(b"fake audio data")
+
+        mock_replicate.run.side_effect = KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            _transcribe_file(str(audio))
+        assert mock_replicate.run.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("tenacity.nap.time.sleep")
+    @patch("src.transcriber._client")
+    def test_uploads_once_across_retries(self, mock_replicate, mock_sleep, tmp_path):
+        """The file is uploaded once, passed by URL, and deleted afterwards."""
+        audio = tmp_path / "test.mp3"
+        audio.write_bytes(b"fake audio data")
+
+        uploaded = MagicMock(id="file123", urls={"get": "https://files/file123"})
+        mock_replicate.files.create.return_value = uploaded
+        mock_replicate.run.side_effect = [
+            ConnectionError("network blip"),
+            iter(["Recovered."]),
+        ]
+
+        assert _transcribe_file(str(audio)) == ("Recovered.", 1)
+        mock_replicate.files.create.assert_called_once_with(str(audio))
+        for call in mock_replicate.run.call_args_list:
+            assert call.kwargs["input"]["audio_file"] == "https://files/file123"
+        mock_replicate.files.delete.assert_called_once_with("file123")
+
 
 class TestCheckTruncation:
     def test_no_warning_for_normal_text(self, caplog):
@@ -90,3 +156,110 @@ class TestCheckTruncation:
         with caplog.at_level("WARNING"):
             _check_truncation(text, chunk_duration_s=60, chunk_index=0)
         assert "punctuation" in caplog.text.lower()
+
+
+class TestTranscribe:
+    @patch("src.transcriber._transcribe_file")
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds")
+    def test_chunks_joined_in_order(self, mock_duration, mock_split, mock_transcribe):
+        """Chunks finishing out of order are still joined in chunk order."""
+        paths = [f"chunk_{i}.mp3" for i in range(4)]
+        mock_duration.return_value = 1200.0
+        mock_split.return_value = [(p, 300.0) for p in paths]
+
+        def fake_transcribe(path):
+            i = paths.index(path)
+            time.sleep(0.05 * (len(paths) - i))  # earlier chunks finish last
+            return f"Text {i}.", 2
+
+        mock_transcribe.side_effect = fake_transcribe
+
+        out = io.StringIO()
+        words = transcribe("long.mp3", out)
+        assert out.getvalue() == "Text 0.\n\nText 1.\n\nText 2.\n\nText 3."
+        assert words == 8
+
+    @patch("src.transcriber._transcribe_file")
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds")
+    def test_completed_prefix_written_before_failure(
+        self, mock_duration, mock_split, mock_transcribe
+    ):
+        """Chunks finished before a failure are already in the output."""
+        mock_duration.return_value = 600.0
+        mock_split.return_value = [("chunk_0.mp3", 300.0), ("chunk_1.mp3", 300.0)]
+        mock_transcribe.side_effect = [("First.", 1), TranscriptionError("boom")]
+
+        out = io.StringIO()
+        with patch("src.config.MAX_PARALLEL_CHUNKS", 1):
+            with pytest.raises(TranscriptionError):
+                transcribe("long.mp3", out)
+        assert out.getvalue() == "First."
+
+    @patch("src.transcriber._transcribe_file")
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds")
+    def test_failure_does_not_wait_for_inflight_chunks(
+        self, mock_duration, mock_split, mock_transcribe
+    ):
+        """An interrupt returns at once instead of waiting on other chunks."""
+        paths = [f"chunk_{i}.mp3" for i in range(3)]
+        mock_duration.return_value = 900.0
+        mock_split.return_value = [(p, 300.0) for p in paths]
+        release = threading.Event()
+
+        def fake_transcribe(path):
+            if path == paths[0]:
+                raise KeyboardInterrupt
+            release.wait(timeout=5)  # a slow upload + prediction
+            return "Late.", 1
+
+        mock_transcribe.side_effect = fake_transcribe
+
+        start = time.monotonic()
+        try:
+            with patch("src.config.MAX_PARALLEL_CHUNKS", 2):
+                with pytest.raises(KeyboardInterrupt):
+                    transcribe("long.mp3", io.StringIO())
+            assert time.monotonic() - start < 1
+        finally:
+            release.set()
+
+    @patch("src.transcriber._transcribe_file")
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds")
+    def test_chunk_dir_removed(self, mock_duration, mock_split, mock_transcribe):
+        """Chunks go to a per-run directory that is removed even on failure."""
+        run_dirs = []
+
+        def fake_split(path, out_dir):
+            run_dirs.append(out_dir)
+            chunk = out_dir / "chunk_000.mp3"
+            chunk.write_bytes(b"fake audio data")
+            return [(str(chunk), 300.0), (str(chunk), 300.0)]
+
+        mock_duration.return_value = 600.0
+        mock_split.side_effect = fake_split
+        mock_transcribe.side_effect = TranscriptionError("boom")
+
+        with pytest.raises(TranscriptionError):
+            transcribe("long.mp3", io.StringIO())
+        assert len(run_dirs) == 1
+        assert not run_dirs[0].exists()
+
+    @patch("src.transcriber._transcribe_file")
+    @patch("src.transcriber.split_audio")
+    @patch("src.transcriber.get_duration_seconds")
+    def test_borderline_file_not_split(
+        self, mock_duration, mock_split, mock_transcribe
+    ):
+        """A file just over MAX_CHUNK_SECONDS is sent whole."""
+        mock_duration.return_value = 330.0
+        mock_transcribe.return_value = ("Whole file.", 2)
+
+        out = io.StringIO()
+        assert transcribe("borderline.mp3", out) == 2
+        assert out.getvalue() == "Whole file."
+        mock_split.assert_not_called()
+        mock_transcribe.assert_called_once_with("borderline.mp3")
@@ -15,6 +15,18 @@ class TestIsYoutubeUrl:
     def test_no_www(self):
         assert is_youtube_url("https://youtube.com/watch?v=abc123")
 
+    def test_subdomain(self):
+        assert is_youtube_url("https://m.youtube.com/watch?v=abc123")
+
+    def test_uppercase_host(self):
+        assert is_youtube_url("HTTPS://WWW.YOUTUBE.COM/watch?v=abc123")
+
+    def test_youtube_in_path_only(self):
+        assert not is_youtube_url("https://example.com/youtube.com/watch")
+
+    def test_lookalike_host(self):
+        assert not is_youtube_url("https://notyoutube.com/watch?v=abc123")
+
     def test_non_youtube(self):
         assert not is_youtube_url("https://vimeo.com/123456")
 
@@ -48,8 +60,8 @@ class TestIsRemoteUrl:
 class TestGenerateFilename:
     def test_has_timestamp_and_suffix(self):
         name = generate_filename()
-        # Format: transcript_YYYYMMDD_HHMMSS_xxxx
-        assert re.match(r"transcript_\d{8}_\d{6}_[a-z0-9]{4}$", name)
+        # Format: transcript_YYYYMMDD_HHMMSS_xxxxxx
+        assert re.match(r"transcript_\d{8}_\d{6}_[0-9a-f]{6}$", name)
 
     def test_custom_prefix(self):
         name = generate_filename(prefix="custom")
@@ -57,7 +69,7 @@ class TestGenerateFilename:
 
     def test_unique(self):
         names = {generate_filename() for _ in range(20)}
-        # With 4-char random suffix, collisions in 20 calls are extremely unlikely.
+        # The counter part of the suffix guarantees in-process uniqueness.
         assert len(names) == 20
 
     def test_with_video_id_only(self):
@@ -79,4 +91,4 @@ class TestGenerateFilename:
 
     def test_no_video_id_uses_timestamp(self):
         name = generate_filename(title="Ignored Without Video ID")
-        assert re.match(r"transcript_\d{8}_\d{6}_[a-z0-9]{4}$", name)
+        assert re.match(r"transcript_\d{8}_\d{6}_[0-9a-f]{6}$", name)